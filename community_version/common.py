@@ -3,22 +3,30 @@
 from __future__ import annotations
 
 import os
+import sys
 import json
+import atexit
 import time
 import argparse
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import TYPE_CHECKING, Dict, List, Tuple, Any, BinaryIO
 from functools import lru_cache
+from itertools import chain, islice, product, zip_longest
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
 
+import numpy as np
+import orjson
 import requests
-from opensearchpy import OpenSearch
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from opensearchpy import OpenSearch, Urllib3HttpConnection
 from opensearchpy.exceptions import TransportError
-from llama_cpp import Llama
 
 import bm25s
 
+if TYPE_CHECKING:  # llama_cpp is imported lazily in load_llm()
+    from llama_cpp import Llama
+
 try:
     import Stemmer  # type: ignore
 except ImportError:  # pragma: no cover - optional dependency
@@ -69,6 +77,10 @@ OPENSEARCH_HOT_SSL  = os.getenv("OPENSEARCH_HOT_SSL", "false").lower() == "true"
 # HOT_INDEX_NAME = env_str("HOT_INDEX_NAME", "bbc")
 HOT_INDEX_NAME = env_str("HOT_INDEX_NAME", "bbc-chunks")
 
+# Pooled keep-alive connections per client, so concurrent searches against the
+# same store reuse sockets instead of opening (and TLS-handshaking) new ones.
+OPENSEARCH_POOL_MAXSIZE = env_int("OPENSEARCH_POOL_MAXSIZE", 32)
+
 
 ##############################################################################
 # NER client
@@ -77,39 +89,60 @@ HOT_INDEX_NAME = env_str("HOT_INDEX_NAME", "bbc-chunks")
 NER_URL = env_str("NER_URL", "http://127.0.0.1:8000/ner")
 NER_TIMEOUT_SECS = float(env_str("NER_TIMEOUT_SECS", "5"))
 
+# Shared keep-alive session so repeated questions reuse the NER connection.
+_NER_SESSION = requests.Session()
+_NER_SESSION.mount("http://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.1),
+))
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 def post_ner(text: str, timeout: float = NER_TIMEOUT_SECS) -> Dict[str, Any]:
-    headers = {"Content-Type": "application/json"}
     payload = {"text": text}
-    r = requests.post(NER_URL, headers=headers, data=json.dumps(payload), timeout=timeout)
+    r = _NER_SESSION.post(NER_URL, data=orjson.dumps(payload), headers=JSON_HEADERS, timeout=timeout)
     try:
         r.raise_for_status()
     except requests.HTTPError as e:
         try:
-            msg = r.json()
+            msg = orjson.loads(r.content)
         except Exception:
             msg = r.text
         raise SystemExit(f"[NER] HTTP {r.status_code}: {msg}") from e
     try:
-        return r.json()
+        return orjson.loads(r.content)
     except Exception as e:
         raise SystemExit(f"[NER] Non-JSON response: {r.text[:800]}") from e
 
 
 def normalize_entities(ner_result: Dict[str, Any]) -> List[str]:
     """Return normalized (lowercased, de-duped) entity strings."""
-    seen, out = set(), []
-    for name in ner_result.get("entities", []):
-        k = name.strip().lower()
-        if k and k not in seen:
-            seen.add(k)
-            out.append(k)
-    return out
+    # dict.fromkeys dedupes while keeping first-seen order
+    names = (name.strip().lower() for name in ner_result.get("entities", []))
+    return list(dict.fromkeys(k for k in names if k))
+
+
+@lru_cache(maxsize=1024)
+def _cached_entities(question: str) -> Tuple[str, ...]:
+    """Memoized NER for repeated questions (tuple so the cached value is immutable)."""
+    return tuple(normalize_entities(post_ner(question)))
+
+
+def question_entities(question: str, cache: bool = True) -> List[str]:
+    """Normalized entities for a question, served from the NER memo unless cache=False."""
+    if cache:
+        return list(_cached_entities(question))
+    return normalize_entities(post_ner(question))
 
 
 ##############################################################################
 # OpenSearch connections (LONG and HOT)
 ##############################################################################
 
+# Clients are cached so every ask()/retrieve() reuses the same warm connection
+# pools instead of building (and handshaking) new ones per question.
+
+@lru_cache(maxsize=1)
 def connect_long() -> Tuple[OpenSearch, str]:
     http_auth = (OPENSEARCH_LONG_USER, OPENSEARCH_LONG_PASS) if OPENSEARCH_LONG_USER and OPENSEARCH_LONG_PASS else None
     client = OpenSearch(
@@ -122,9 +155,13 @@ def connect_long() -> Tuple[OpenSearch, str]:
         timeout=60,
         max_retries=3,
         retry_on_timeout=True,
+        connection_class=Urllib3HttpConnection,
+        pool_maxsize=OPENSEARCH_POOL_MAXSIZE,
+        http_compress=True,  # gzip on the wire; responses carry multi-KB content
     )
     return client, LONG_INDEX_NAME
 
+@lru_cache(maxsize=1)
 def connect_hot() -> Tuple[OpenSearch, str]:
     http_auth = (OPENSEARCH_HOT_USER, OPENSEARCH_HOT_PASS) if OPENSEARCH_HOT_USER and OPENSEARCH_HOT_PASS else None
     client = OpenSearch(
@@ -137,14 +174,57 @@ def connect_hot() -> Tuple[OpenSearch, str]:
         timeout=60,
         max_retries=3,
         retry_on_timeout=True,
+        connection_class=Urllib3HttpConnection,
+        pool_maxsize=OPENSEARCH_POOL_MAXSIZE,
+        http_compress=True,  # gzip on the wire; responses carry multi-KB content
     )
     return client, HOT_INDEX_NAME
 
 
+# One long-lived pool for NER and the per-store searches; its threads are started
+# once and reused by every retrieve() call.
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ossearch")
+atexit.register(_SEARCH_POOL.shutdown)
+
+
 ##############################################################################
 # Query builder (lexical-first, auditable)
 ##############################################################################
 
+# Constant pieces of the entity queries are built once and shared by every
+# query. Nothing mutates a query after it is built, so sharing is safe, and it
+# is cheaper than deep-copying a full skeleton per call.
+_ENTITY_TEXT_FIELDS = ["content^1.0", "category^0.5"]
+_ALL_TERMS_SCRIPT = {"source": "params.num_terms"}
+
+
+def _no_entity_query(question: str) -> Dict[str, Any]:
+    """dis_max over a single match on the full question."""
+    return {
+        "dis_max": {
+            "tie_breaker": 0.0,
+            "queries": [
+                {"match": {"content": {"query": question}}}
+            ]
+        }
+    }
+
+
+def _or_branch(entities: List[str], joined: str) -> Dict[str, Any]:
+    """OR-style entity branch shared by both query builders (boost 10.0)."""
+    return {
+        "bool": {
+            "should": [
+                {"terms": {"explicit_terms": entities}},
+                {"match": {"explicit_terms_text": joined}},
+                {"multi_match": {"query": joined, "fields": _ENTITY_TEXT_FIELDS}},
+            ],
+            "minimum_should_match": 1,
+            "boost": 10.0
+        }
+    }
+
+
 def build_query_opensearch_ranking(question: str, entities: List[str]) -> Dict[str, Any]:
     """
     - If no entities -> dis_max over a single match on the full question.
@@ -162,14 +242,7 @@ def build_query_opensearch_ranking(question: str, entities: List[str]) -> Dict[s
     - No fallback full-question clause when entities are present.
     """
     if not entities:
-        return {
-            "dis_max": {
-                "tie_breaker": 0.0,
-                "queries": [
-                    {"match": {"content": {"query": question}}}
-                ]
-            }
-        }
+        return _no_entity_query(question)
 
     joined = " ".join(entities)
 
@@ -180,7 +253,7 @@ def build_query_opensearch_ranking(question: str, entities: List[str]) -> Dict[s
                     "terms_set": {
                         "explicit_terms": {
                             "terms": entities,
-                            "minimum_should_match_script": {"source": "params.num_terms"}
+                            "minimum_should_match_script": _ALL_TERMS_SCRIPT
                         }
                     }
                 },
@@ -195,7 +268,7 @@ def build_query_opensearch_ranking(question: str, entities: List[str]) -> Dict[s
                 {
                     "multi_match": {
                         "query": joined,
-                        "fields": ["content^1.0", "category^0.5"],
+                        "fields": _ENTITY_TEXT_FIELDS,
                         "operator": "and"
                     }
                 }
@@ -205,17 +278,7 @@ def build_query_opensearch_ranking(question: str, entities: List[str]) -> Dict[s
         }
     }
 
-    or_bool = {
-        "bool": {
-            "should": [
-                {"terms": {"explicit_terms": entities}},
-                {"match": {"explicit_terms_text": joined}},
-                {"multi_match": {"query": joined, "fields": ["content^1.0", "category^0.5"]}},
-            ],
-            "minimum_should_match": 1,
-            "boost": 10.0
-        }
-    }
+    or_bool = _or_branch(entities, joined)
 
     return {
         "dis_max": {
@@ -243,28 +306,11 @@ def build_query_external_ranking(question: str, entities: List[str]) -> Dict[str
     - No fallback full-question clause when entities are present.
     """
     if not entities:
-        return {
-            "dis_max": {
-                "tie_breaker": 0.0,
-                "queries": [
-                    {"match": {"content": {"query": question}}}
-                ]
-            }
-        }
+        return _no_entity_query(question)
 
     joined = " ".join(entities)
 
-    or_bool = {
-        "bool": {
-            "should": [
-                {"terms": {"explicit_terms": entities}},
-                {"match": {"explicit_terms_text": joined}},
-                {"multi_match": {"query": joined, "fields": ["content^1.0", "category^0.5"]}},
-            ],
-            "minimum_should_match": 1,
-            "boost": 10.0
-        }
-    }
+    or_bool = _or_branch(entities, joined)
 
     return {
         "dis_max": {
@@ -279,6 +325,9 @@ def build_query_external_ranking(question: str, entities: List[str]) -> Dict[str
 
 @lru_cache(maxsize=1)
 def load_llm() -> Llama:
+    # Deferred so importing this module (or --help) skips llama.cpp/GGML init
+    from llama_cpp import Llama
+
     return Llama(
         model_path=str(Path(env_str("MODEL_PATH",
                                     str(Path.home() / "models" / "neural-chat-7b-v3-3.Q4_K_M.gguf"))).expanduser()),
@@ -316,37 +365,126 @@ SOURCE_FIELDS = [
     "ingested_at_ms", "doc_version"
 ]
 
+# Two-phase fetch for the internal ranker: search returns only the light fields,
+# then the heavy text fields are fetched for the hits that survive ranking.
+LIGHT_SOURCE_FIELDS = ["filepath", "category", "explicit_terms", "ingested_at_ms", "doc_version"]
+DEFERRED_SOURCE_FIELDS = ["content", "explicit_terms_text"]
+
+# Every field except the query is fixed per (light, with_highlight, exact_total)
+# combination, so the variants are built once and each search only adds its query.
+_BODY_TEMPLATES: Dict[Tuple[bool, bool, bool], Dict[str, Any]] = {
+    (light, with_highlight, exact_total): {
+        "_source": LIGHT_SOURCE_FIELDS if light else SOURCE_FIELDS,
+        "size": SEARCH_SIZE,
+        "explain": DO_EXPLAIN,
+        "profile": DO_PROFILE,
+        # An exact total is only needed under observability or when results are
+        # saved; otherwise counting stops once SEARCH_SIZE matches are found.
+        "track_total_hits": True if exact_total else SEARCH_SIZE,
+        # Highlights are only rendered by render_matches(), i.e. under observability
+        **({"highlight": HIGHLIGHT} if with_highlight else {}),
+    }
+    for light, with_highlight, exact_total in product((False, True), repeat=3)
+}
+
+
+def search_body(query: Dict[str, Any], light: bool = False, with_highlight: bool = True,
+                exact_total: bool = True) -> Dict[str, Any]:
+    """Search body; light=True requests only LIGHT_SOURCE_FIELDS (two-phase fetch)."""
+    return {"query": query, **_BODY_TEMPLATES[(light, with_highlight, exact_total)]}
+
+
+def failed_search(label: str, index_name: str, query: Dict[str, Any], error: str) -> Dict[str, Any]:
+    """Soft-fail: empty result + diagnostic, shaped like a normal search response."""
+    return {
+        "_store_label": label,
+        "_index_used": index_name,
+        "_query": query,
+        "_error": error,
+        "hits": {"total": {"value": 0, "relation": "eq"}, "hits": []}
+    }
+
+
 def search_one(
     label: str,
     client: OpenSearch,
     index_name: str,
     query: Dict[str, Any],
 ) -> Dict[str, Any]:
-    """Execute a single search with observability toggles."""
-    body = {
-        "query": query,
-        "_source": SOURCE_FIELDS,
-        "highlight": HIGHLIGHT,
-        "size": SEARCH_SIZE,
-        "explain": DO_EXPLAIN,
-        "profile": DO_PROFILE,
-        "track_total_hits": True,
-    }
+    """Execute a single search (a one-query _msearch, so both paths share one request shape)."""
+    return search_many(label, client, index_name, [query])[0]
+
+
+def search_many(
+    label: str,
+    client: OpenSearch,
+    index_name: str,
+    queries: List[Dict[str, Any]],
+    light: bool = False,
+    with_highlight: bool = True,
+    exact_total: bool = True,
+) -> List[Dict[str, Any]]:
+    """Execute several searches against one store in a single _msearch round-trip."""
+    if not queries:
+        return []
+    header = {"index": index_name, "preference": PREFERENCE, "search_type": "query_then_fetch"}
+    body: List[Dict[str, Any]] = []
+    for query in queries:
+        body.append(header)
+        body.append(search_body(query, light, with_highlight, exact_total))
     try:
-        res = client.search(index=index_name, body=body, preference=PREFERENCE, request_timeout=10)
+        res = client.msearch(body=body, request_timeout=30)
     except TransportError as e:
-        # Soft-fail: return empty result + diagnostic
-        return {
-            "_store_label": label,
-            "_index_used": index_name,
-            "_query": query,
-            "_error": f"{e.__class__.__name__}: {getattr(e, 'error', str(e))}",
-            "hits": {"total": {"value": 0, "relation": "eq"}, "hits": []}
-        }
-    res["_store_label"] = label
-    res["_index_used"]  = index_name
-    res["_query"]       = query
-    return res
+        error = f"{e.__class__.__name__}: {getattr(e, 'error', str(e))}"
+        return [failed_search(label, index_name, q, error) for q in queries]
+
+    out: List[Dict[str, Any]] = []
+    for query, sub in zip(queries, res.get("responses", [])):
+        if sub.get("error"):
+            # Sub-searches fail independently; keep the same soft-fail shape
+            err = sub["error"]
+            reason = err.get("reason", err) if isinstance(err, dict) else err
+            out.append(failed_search(label, index_name, query, f"msearch error (status {sub.get('status')}): {reason}"))
+            continue
+        sub["_store_label"] = label
+        sub["_index_used"]  = index_name
+        sub["_query"]       = query
+        out.append(sub)
+    return out
+
+
+def fetch_deferred_source(label: str, client: OpenSearch, hits: List[Dict[str, Any]]) -> None:
+    """
+    Second phase of the two-phase fetch: one _mget for the DEFERRED_SOURCE_FIELDS
+    of the given hits, spliced into each hit's _source in place. Each doc carries
+    its own _index and routing so the lookup goes straight to the right shard.
+    """
+    by_key: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for h in hits:
+        by_key.setdefault((h.get("_index", ""), h["_id"]), []).append(h)
+    if not by_key:
+        return
+
+    docs: List[Dict[str, Any]] = []
+    for (index, doc_id), same in by_key.items():
+        doc = {"_index": index, "_id": doc_id, "_source": DEFERRED_SOURCE_FIELDS}
+        routing = same[0].get("_routing")
+        if routing is not None:
+            doc["routing"] = routing
+        docs.append(doc)
+
+    try:
+        res = client.mget(body={"docs": docs}, request_timeout=10)
+    except TransportError as e:
+        # Soft-fail like search: hits without content are skipped by build_context
+        print(f"[FETCH] {label} _mget failed: {e.__class__.__name__}: {getattr(e, 'error', str(e))}")
+        return
+
+    for doc in res.get("docs", []):
+        if not doc.get("found"):
+            continue
+        for h in by_key.get((doc.get("_index", ""), doc.get("_id")), []):
+            h.setdefault("_source", {}).update(doc.get("_source", {}))
 
 
 def rerank_hits_with_bm25(
@@ -454,8 +592,9 @@ def rank_hits(res: Dict[str, Any]) -> List[Dict[str, Any]]:
     hits = res.get("hits", {}).get("hits", []) or []
     if not hits:
         return []
-    top1 = hits[0]["_score"]
-    keep = [h for h in hits if h["_score"] >= ALPHA * top1]
+    # Vectorized threshold; float64 keeps the comparison identical to Python floats
+    scores = np.fromiter((h["_score"] for h in hits), dtype=np.float64, count=len(hits))
+    keep = [hits[i] for i in np.flatnonzero(scores >= ALPHA * scores[0]).tolist()]
     # Annotate with store for downstream prints
     for h in keep:
         h["_store_label"] = res.get("_store_label", "?")
@@ -468,16 +607,8 @@ def combine_hits(hits_a: List[Dict[str, Any]], hits_b: List[Dict[str, Any]], top
     Combine two per-store lists without pretending cross-store scores are comparable.
     Policy: interleave A and B (stable) while preserving each list's order.
     """
-    combined: List[Dict[str, Any]] = []
-    ia = ib = 0
-    while len(combined) < top_k and (ia < len(hits_a) or ib < len(hits_b)):
-        if ia < len(hits_a):
-            combined.append(hits_a[ia]); ia += 1
-        if len(combined) >= top_k:
-            break
-        if ib < len(hits_b):
-            combined.append(hits_b[ib]); ib += 1
-    return combined
+    interleaved = chain.from_iterable(zip_longest(hits_a, hits_b))
+    return list(islice((h for h in interleaved if h is not None), max(top_k, 0)))
 
 
 def render_observability_summary(res: Dict[str, Any]) -> str:
@@ -516,29 +647,57 @@ def build_context(hits: List[Dict[str, Any]], max_chars_per_doc: int = 0) -> str
     if not hits:
         return ""
     
+    limit = max_chars_per_doc if max_chars_per_doc > 0 else None
     out = []
     for h in hits:
         src = h.get("_source", {})
+        # Slice before stripping so large documents are not scanned end to end
+        content = (src.get("content") or "")[:limit].strip()
+        if not content:
+            continue
         fp  = src.get("filepath", "<unknown>")
         store = h.get("_store_label", "?")
-        content = (src.get("content") or "").strip()
-        if max_chars_per_doc > 0:
-            content = content[:max_chars_per_doc]
         out.append(f"---\nStore: {store}\nDoc: {fp}\n{content}\n")
     return "\n".join(out)
 
 
+# Append handles stay open for the life of the process so a batch of questions
+# costs one open() per results file. Each record is flushed as it is written so
+# audit lines survive a crash or SIGTERM; the handles are closed on exit.
+_SAVE_WRITER: Dict[str, BinaryIO] = {}
+
+
+def _close_save_writers() -> None:
+    for w in _SAVE_WRITER.values():
+        w.close()
+    _SAVE_WRITER.clear()
+
+
+atexit.register(_close_save_writers)
+
+
 def save_results(path: str, payload: Dict[str, Any]) -> None:
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+    w = _SAVE_WRITER.get(path)
+    if w is None:
+        w = _SAVE_WRITER[path] = open(path, "ab")
+    w.write(orjson.dumps(payload) + b"\n")
+    w.flush()
 
 
 ##############################################################################
 # Orchestrator
 ##############################################################################
 
-def generate_answer(llm: Llama, question: str, context: str, observability: bool = False) -> str:
+def generate_answer(llm: Llama, question: str, context: str, observability: bool = False,
+                    stream: bool = False, stream_header: str = "") -> str:
+    """
+    Answer from context only. With stream=True tokens are written to stdout as
+    they are generated, preceded by stream_header (printed after any prompt
+    dump); the full answer is still returned.
+    """
     if not context.strip():
+        if stream:
+            print(stream_header + "No supporting documents found.")
         return "No supporting documents found."
     
     sys_msg = "Answer using ONLY the provided context below."
@@ -556,47 +715,36 @@ def generate_answer(llm: Llama, question: str, context: str, observability: bool
     resp = llm.create_chat_completion(
         messages=[{"role": "system", "content": sys_msg},
                   {"role": "user", "content": user_prompt}],
-        temperature=0.2, top_p=0.8, max_tokens=32768,
+        temperature=0.2, top_p=0.8, max_tokens=32768, stream=stream,
     )
-    return resp["choices"][0]["message"]["content"].strip()
-
-
-def ask(llm: Llama, question: str, *, observability: bool = True,  external_ranker: bool = True,
-        top_k: int = 10, save_path: str | None = None) -> Tuple[str, List[Dict[str, Any]]]:
-    # 1) NER
-    ner = post_ner(question)
-    entities = normalize_entities(ner)
-
-    # 2) Build query to match <original>
-    if external_ranker:
-        if observability:
-            print("\n\nUsing EXTERNAL ranking with BM25 re-ranking after retrieval.\n\n")
-        query = build_query_external_ranking(question, entities)
-    else:
-        if observability:
-            print("\n\nUsing INTERNAL OpenSearch ranking only.\n\n")
-        query = build_query_opensearch_ranking(question, entities)
-
-    if observability:
-        if entities:
-            print(f"[NER] entities: {entities}")
-            print("\n[QUERY] dis_max (entity path):")
-        else:
-            print("[NER] No entities detected; using full-question match only.")
-            print("\n[QUERY] dis_max (no-entity path):")
-        print(json.dumps(query, indent=2))
-
-    # 3) Connect stores
-    long_client, long_index = connect_long()
-    hot_client,  hot_index  = connect_hot()
-
-    # 4) Execute in parallel
-    with ThreadPoolExecutor(max_workers=2) as ex:
-        fut_long = ex.submit(search_one, "LONG", long_client, long_index, query)
-        fut_hot  = ex.submit(search_one, "HOT",  hot_client,  hot_index,  query)
-        res_long = fut_long.result()
-        res_hot  = fut_hot.result()
-
+    if not stream:
+        return resp["choices"][0]["message"]["content"].strip()
+
+    sys.stdout.write(stream_header)
+    sys.stdout.flush()
+    chunks: List[str] = []
+    for part in resp:
+        delta = part["choices"][0]["delta"].get("content")
+        if delta:
+            chunks.append(delta)
+            sys.stdout.write(delta)
+            sys.stdout.flush()
+    sys.stdout.write("\n")
+    return "".join(chunks).strip()
+
+
+def _rank_and_record(
+    question: str,
+    entities: List[str],
+    res_long: Dict[str, Any],
+    res_hot: Dict[str, Any],
+    *,
+    observability: bool,
+    external_ranker: bool,
+    top_k: int,
+    save_path: str | None,
+    tag: str = "",
+) -> List[Dict[str, Any]]:
     # 5) Rank per store (tolerate 0 hits)
     if external_ranker:
         keep_long, keep_hot, combined = rerank_hits_with_bm25(question, res_long, res_hot, top_k=top_k)
@@ -607,6 +755,7 @@ def ask(llm: Llama, question: str, *, observability: bool = True,  external_rank
     
     # 6) Optional observability prints
     if observability:
+        print(f"\n{tag} RESULTS FOR: {question}")
         print(render_observability_summary(res_long))
         print(render_observability_summary(res_hot))
         print(f"\n[RESULTS] LONG kept={len(keep_long)} of {len(res_long.get('hits',{}).get('hits',[]))}")
@@ -616,7 +765,7 @@ def ask(llm: Llama, question: str, *, observability: bool = True,  external_rank
     # 7) Optional save (compact JSONL)
     if save_path:
         payload = {
-            "ts": datetime.utcnow().isoformat() + "Z",
+            "ts_ns": time.time_ns(),
             "question": question,
             "entities": entities,
             "alpha": ALPHA,
@@ -639,6 +788,121 @@ def ask(llm: Llama, question: str, *, observability: bool = True,  external_rank
         }
         save_results(save_path, payload)
 
+    return combined
+
+
+def retrieve(questions: List[str], *, observability: bool = True, external_ranker: bool = True,
+             top_k: int = 10, save_path: str | None = None,
+             ner_cache: bool = True) -> List[List[Dict[str, Any]]]:
+    """
+    NER -> query -> dual-store search -> rank for a batch of questions.
+    Each store receives one _msearch carrying every question's query, so N
+    questions cost two HTTP round-trips instead of 2*N. The no-entity search
+    runs speculatively alongside NER so its latency overlaps the NER call.
+    With the internal ranker, content is fetched only for the kept hits.
+    Returns the combined hits for each question, in order.
+    """
+    if not questions:
+        return []
+
+    build_query = build_query_external_ranking if external_ranker else build_query_opensearch_ranking
+    # BM25 re-ranking scores every hit's content, so only the internal ranker
+    # can defer the heavy fields until after ranking.
+    light = not external_ranker
+    # (light, with_highlight, exact_total) for search_many; saved audit records
+    # report "total", so it stays exact whenever results are saved
+    search_opts = (light, observability or DO_EXPLAIN, observability or bool(save_path))
+
+    long_client, long_index = connect_long()
+    hot_client,  hot_index  = connect_hot()
+
+    # The no-entity query depends only on the question text, so it is sent
+    # speculatively while NER is still running. Questions that come back
+    # without entities use those results directly.
+    fut_ner = _SEARCH_POOL.submit(lambda: [question_entities(q, ner_cache) for q in questions])
+    spec_queries = [build_query(q, []) for q in questions]
+    fut_long_spec = _SEARCH_POOL.submit(search_many, "LONG", long_client, long_index, spec_queries, *search_opts)
+    fut_hot_spec  = _SEARCH_POOL.submit(search_many, "HOT",  hot_client,  hot_index,  spec_queries, *search_opts)
+
+    # 1) NER
+    entities_list = fut_ner.result()
+
+    # 2) Build query to match <original>
+    if observability:
+        if external_ranker:
+            print("\n\nUsing EXTERNAL ranking with BM25 re-ranking after retrieval.\n\n")
+        else:
+            print("\n\nUsing INTERNAL OpenSearch ranking only.\n\n")
+    # Observability blocks for a batch print before any answer, so each one is
+    # tagged with its question
+    tags = [f"[Q{n}/{len(questions)}]" for n in range(1, len(questions) + 1)]
+    queries: List[Dict[str, Any]] = []
+    for question, entities, spec_query, tag in zip(questions, entities_list, spec_queries, tags):
+        query = build_query(question, entities) if entities else spec_query
+
+        if observability:
+            print(f"\n{tag} QUESTION: {question}")
+            if entities:
+                print(f"[NER] entities: {entities}")
+                print("\n[QUERY] dis_max (entity path):")
+            else:
+                print("[NER] No entities detected; using full-question match only.")
+                print("\n[QUERY] dis_max (no-entity path):")
+            print(json.dumps(query, indent=2))
+        queries.append(query)
+
+    # 3) Execute the entity queries: one _msearch per store
+    need = [i for i, entities in enumerate(entities_list) if entities]
+    if need:
+        entity_queries = [queries[i] for i in need]
+        fut_long = _SEARCH_POOL.submit(search_many, "LONG", long_client, long_index, entity_queries, *search_opts)
+        fut_hot  = _SEARCH_POOL.submit(search_many, "HOT",  hot_client,  hot_index,  entity_queries, *search_opts)
+
+    # 4) Collect: speculative results for no-entity questions, entity results for the rest
+    if len(need) == len(questions):
+        # Nothing can use the speculative searches; they may already be in flight.
+        fut_long_spec.cancel()
+        fut_hot_spec.cancel()
+        results_long: List[Dict[str, Any]] = [{}] * len(questions)
+        results_hot:  List[Dict[str, Any]] = [{}] * len(questions)
+    else:
+        results_long = list(fut_long_spec.result())
+        results_hot  = list(fut_hot_spec.result())
+
+    if need:
+        for i, res_long, res_hot in zip(need, fut_long.result(), fut_hot.result()):
+            results_long[i] = res_long
+            results_hot[i]  = res_hot
+
+    results = [
+        _rank_and_record(
+            question, entities, res_long, res_hot,
+            observability=observability, external_ranker=external_ranker,
+            top_k=top_k, save_path=save_path, tag=tag,
+        )
+        for question, entities, res_long, res_hot, tag in zip(questions, entities_list, results_long, results_hot, tags)
+    ]
+
+    # Two-phase fetch: pull content only for the hits that survived ranking
+    if not external_ranker:
+        survivors = [h for hits in results for h in hits]
+        fetches = [
+            _SEARCH_POOL.submit(fetch_deferred_source, label, client,
+                                [h for h in survivors if h.get("_store_label") == label])
+            for label, client in (("LONG", long_client), ("HOT", hot_client))
+        ]
+        for fut in fetches:
+            fut.result()
+
+    return results
+
+
+def ask(llm: Llama, question: str, *, observability: bool = True,  external_ranker: bool = True,
+        top_k: int = 10, save_path: str | None = None,
+        ner_cache: bool = True) -> Tuple[str, List[Dict[str, Any]]]:
+    combined = retrieve([question], observability=observability, external_ranker=external_ranker,
+                        top_k=top_k, save_path=save_path, ner_cache=ner_cache)[0]
+
     # 8) Build context and answer (short-circuit if none)
     context_block = build_context(combined)
     
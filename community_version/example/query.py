@@ -69,7 +69,6 @@ except Exception as e:
 import requests
 from opensearchpy import OpenSearch
 from opensearchpy.exceptions import TransportError
-from llama_cpp import Llama
 
 
 ##############################################################################
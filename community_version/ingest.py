@@ -3,13 +3,23 @@
 Ingest BBC articles into OpenSearch with explicit multi-term recall and
 paragraph-level chunking for retrieval.
 """
-import os, glob, time
+import argparse, hashlib, logging, os, re, threading, time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+import orjson
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from opensearchpy import OpenSearch
+from opensearchpy import OpenSearch, helpers
+
+import ner_model
+
+logger = logging.getLogger(__name__)
 
 # ----------------------------
 # Config
@@ -26,44 +36,247 @@ OPENSEARCH_SSL  = os.getenv("OPENSEARCH_SSL", "false").lower() == "true"
 
 # NER server URL
 DEFAULT_URL = "http://127.0.0.1:8000/ner"
+# Files whose NER requests may be in flight concurrently
+NER_WORKERS = int(os.getenv("NER_WORKERS", "16"))
+
+# NER backend: "local" runs the NER service's spaCy pipeline (ner_model) in this process
+# (no HTTP hop); "http" posts to the NER service at DEFAULT_URL.
+NER_MODE = os.getenv("NER_MODE", "local").lower()
+# Local mode: articles per nlp.pipe batch and spaCy worker processes
+NER_BATCH_SIZE = int(os.getenv("NER_BATCH_SIZE", "64"))
+NER_PROCESSES  = int(os.getenv("NER_PROCESSES", "1"))
+
+# Progress is logged every PROGRESS_EVERY docs; per-doc detail needs LOG_LEVEL=DEBUG
+PROGRESS_EVERY = int(os.getenv("PROGRESS_EVERY", "100"))
+
+# File reads: reader threads and max files read ahead of NER (bounds memory)
+READ_WORKERS  = int(os.getenv("READ_WORKERS", "8"))
+READ_PREFETCH = int(os.getenv("READ_PREFETCH", "64"))
+
+# Bulk indexing: docs per _bulk request, and a body-size cap with headroom
+# under AWS-style 10 MiB HTTP limits. Batches split on whichever is hit first.
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+BULK_MAX_BYTES  = int(os.getenv("BULK_MAX_BYTES", str(8 * 1024 * 1024)))
+
+# Index settings applied for the duration of a bulk load, and the flat keys
+# restored afterwards. Segments are merged down to FORCE_MERGE_SEGMENTS at the
+# end (0 disables the force merge).
+INGEST_SETTINGS = {
+    "refresh_interval": "-1",
+    "number_of_replicas": 0,
+    "translog": {"flush_threshold_size": "1gb"},
+}
+INGEST_SETTING_KEYS = (
+    "index.refresh_interval",
+    "index.number_of_replicas",
+    "index.translog.flush_threshold_size",
+)
+FORCE_MERGE_SEGMENTS = int(os.getenv("FORCE_MERGE_SEGMENTS", "5"))
+
+# On-disk NER results keyed by content hash, so re-ingesting unchanged text
+# makes no NER calls. Entries live in a subdirectory per NER backend, model and
+# label set. Set NER_CACHE_DIR="" to disable; delete it to reset.
+NER_CACHE_DIR = os.getenv("NER_CACHE_DIR", ".ner_cache")
 
 # ----------------------------
 # NER
 # ----------------------------
-def post_ner(text: str, timeout: float = 5.0) -> dict:
-    headers = {"Content-Type": "application/json"}
+# One pooled keep-alive session shared by all NER worker threads. NER is
+# idempotent, so POSTs are safe to retry on transient server errors.
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=frozenset({"POST"}),
+        # Hand the last response back instead of raising RetryError, so the
+        # HTTP-status diagnostics in post_ner/post_ner_batch still apply
+        raise_on_status=False,
+    ),
+))
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _cache_namespace() -> Optional[str]:
+    """
+    Cache subdirectory for the active NER backend, model and label set, so
+    switching NER_MODE, SPACY_MODEL or the labels never serves stale entities.
+    In http mode the model is the one the service reports on /health; if it
+    cannot be determined, returns None and the disk cache is off for this run.
+    """
+    if NER_MODE == "http":
+        try:
+            r = SESSION.get(DEFAULT_URL.rsplit("/", 1)[0] + "/health", timeout=5.0)
+            model = orjson.loads(r.content).get("model") if r.ok else None
+        except Exception:
+            model = None
+        if not isinstance(model, str) or not model:
+            logger.warning("[WARN] NER model unknown (no /health); NER disk cache disabled for this run")
+            return None
+        backend = f"http|{DEFAULT_URL}"
+    else:
+        model = ner_model.SPACY_MODEL
+        backend = "local"
+    labels = ",".join(sorted(ner_model.DEFAULT_INTERESTING_ENTITY_TYPES))
+    digest = hashlib.blake2b(f"{backend}|{model}|{labels}".encode("utf-8"), digest_size=4).hexdigest()
+    safe_model = re.sub(r"[^\w.-]", "_", model)  # SPACY_MODEL may be a path
+    return f"{NER_MODE}-{safe_model}-{digest}"
+
+
+def _cache_path(key: str) -> Optional[Path]:
+    """Cache file for key, or None when caching is disabled or the namespace is unknown."""
+    if not NER_CACHE_DIR:
+        return None
+    namespace = _cache_namespace()
+    if namespace is None:
+        return None
+    return Path(NER_CACHE_DIR) / namespace / key[:2] / key
+
+
+def cache_get(key: str) -> Optional[dict]:
+    """Cached NER result for key, or None on a miss (or when caching is disabled)."""
+    path = _cache_path(key)
+    if path is None:
+        return None
+    try:
+        return orjson.loads(path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
+def cache_put(key: str, value: dict) -> None:
+    path = _cache_path(key)
+    if path is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write-then-rename so concurrent workers never read a partial entry
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(orjson.dumps(value))
+    os.replace(tmp, path)
+
+
+def post_ner(text: str, timeout: float = 5.0, spans: bool = False) -> dict:
+    key = content_hash(text) + (".spans" if spans else "")
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+
     payload = {
         "text": text,
     }
-    r = requests.post(DEFAULT_URL, headers=headers, data=json.dumps(payload), timeout=timeout)
+    if spans:
+        payload["spans"] = True
+    r = SESSION.post(DEFAULT_URL, data=orjson.dumps(payload), headers=JSON_HEADERS, timeout=timeout)
     # Raise for non-2xx to surface useful diagnostics
     try:
         r.raise_for_status()
     except requests.HTTPError as e:
         # try to show server-provided JSON error if present
         try:
-            msg = r.json()
+            msg = orjson.loads(r.content)
         except Exception:
             msg = r.text
         raise SystemExit(f"HTTP {r.status_code} from server: {msg}") from e
     try:
-        return r.json()
+        result = orjson.loads(r.content)
     except Exception as e:
         raise SystemExit(f"Server returned non-JSON response: {r.text[:2000]}") from e
 
+    cache_put(key, {k: result[k] for k in ("entities", "spans") if k in result})
+    return result
+
+
+def post_ner_batch(texts: List[str], timeout: float = 30.0) -> List[List[str]]:
+    """Run NER over many texts in one POST; returns one entity list per text."""
+    keys = [content_hash(t) for t in texts]
+    results = [cache_get(k) for k in keys]
+    missing = [i for i, res in enumerate(results) if res is None]
+    if not missing:
+        return [res.get("entities", []) for res in results]
+
+    r = SESSION.post(
+        DEFAULT_URL,
+        data=orjson.dumps({"texts": [texts[i] for i in missing]}),
+        headers=JSON_HEADERS,
+        timeout=timeout,
+    )
+    entities = None
+    if r.status_code != 400:
+        try:
+            r.raise_for_status()
+        except requests.HTTPError as e:
+            raise SystemExit(f"HTTP {r.status_code} from server: {r.text[:2000]}") from e
+        try:
+            entities = orjson.loads(r.content).get("entities")
+        except Exception as e:
+            raise SystemExit(f"Server returned non-JSON response: {r.text[:2000]}") from e
+
+    # Older servers only understand {"text": ...}: fall back to one call per text.
+    if (
+        not isinstance(entities, list)
+        or len(entities) != len(missing)
+        or not all(isinstance(e, list) for e in entities)
+    ):
+        for i in missing:
+            results[i] = post_ner(texts[i])
+    else:
+        for i, names in zip(missing, entities):
+            results[i] = {"entities": names}
+            cache_put(keys[i], results[i])
+    return [res.get("entities", []) for res in results]
+
+
+def post_ner_spans(text: str, timeout: float = 30.0) -> Optional[List[dict]]:
+    """Entity spans ({text, start, end}) for the text, or None if the server lacks offsets."""
+    spans = post_ner(text, timeout=timeout, spans=True).get("spans")
+    if not isinstance(spans, list):
+        return None
+    return spans
+
+
+def ner_batch(texts: List[str]) -> List[List[dict]]:
+    """In-process NER: entity spans ({text, start, end}) for each text via nlp.pipe."""
+    keys = [content_hash(t) + ".spans" for t in texts]
+    results = [cache_get(k) for k in keys]
+    missing = [i for i, res in enumerate(results) if res is None or "spans" not in res]
+    if missing:
+        # Same spaCy model and label filter as the NER service (loaded on first use)
+        nlp = ner_model.load_spacy()
+        disable = [name for name in ("parser", "lemmatizer") if name in nlp.pipe_names]
+        docs = nlp.pipe(
+            (texts[i] for i in missing),
+            batch_size=NER_BATCH_SIZE,
+            n_process=NER_PROCESSES,
+            disable=disable,
+        )
+        for i, doc in zip(missing, docs):
+            spans = ner_model.entity_spans_from_doc(doc, ner_model.DEFAULT_INTERESTING_ENTITY_TYPES)
+            results[i] = {"entities": _normalize_entities(s["text"] for s in spans), "spans": spans}
+            cache_put(keys[i], results[i])
+    return [res["spans"] for res in results]
+
+
+def _normalize_entities(names: Iterable[str]) -> List[str]:
+    # dict.fromkeys dedupes while preserving first-seen order
+    return list(dict.fromkeys(name.lower() for name in names))
+
 
 def extract_normalized_entities_from_text(text: str) -> List[str]:
     """Return unique, case-normalized named entities detected in the text."""
-    ner_result = post_ner(text)
+    return _normalize_entities(post_ner(text).get("entities", []))
 
-    seen, normalized = set(), []
-    for name in ner_result.get("entities", []):
-        k = name.lower()
-        if k not in seen:
-            seen.add(k)
-            normalized.append(k)
 
-    return normalized
+def extract_normalized_entities_batch(texts: List[str]) -> List[List[str]]:
+    """Batched variant of extract_normalized_entities_from_text (one POST)."""
+    return [_normalize_entities(names) for names in post_ner_batch(texts)]
 
 
 def extract_normalized_entities(text_file: Path) -> List[str]:
@@ -72,25 +285,32 @@ def extract_normalized_entities(text_file: Path) -> List[str]:
     return extract_normalized_entities_from_text(text)
 
 
-def split_into_paragraphs(text: str) -> List[str]:
-    """Split text into non-empty paragraphs separated by blank lines."""
-    paragraphs: List[str] = []
-    current: List[str] = []
+# Every line boundary str.splitlines() recognizes, folded to "\n" by normalize_newlines
+_NEWLINE_RE = re.compile(r"\r\n|[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+# Paragraph separator: a line break, optional whitespace-only lines, line break
+_PARA_RE = re.compile(r"\n\s*\n")
 
-    for line in text.splitlines():
-        if line.strip():
-            current.append(line)
-            continue
 
-        if current:
-            paragraphs.append("\n".join(current).strip())
-            current = []
+def normalize_newlines(text: str) -> str:
+    """Fold CRLF, bare CR and other line boundaries to "\n" (LF-only text is unchanged)."""
+    return _NEWLINE_RE.sub("\n", text)
 
-    if current:
-        paragraphs.append("\n".join(current).strip())
 
+def split_into_paragraphs(text: str) -> List[str]:
+    """Split text into non-empty paragraphs separated by blank lines (expects normalize_newlines text)."""
+    paragraphs = [p.strip() for p in _PARA_RE.split(text) if p.strip()]
     return paragraphs or ([text.strip()] if text.strip() else [])
 
+def paragraph_offsets(text: str, paragraphs: List[str]) -> List[Tuple[int, int]]:
+    """(start, end) character offsets of each paragraph within the source text."""
+    offsets: List[Tuple[int, int]] = []
+    pos = 0
+    for paragraph in paragraphs:
+        start = text.find(paragraph, pos)
+        pos = start + len(paragraph)
+        offsets.append((start, pos))
+    return offsets
+
 # ----------------------------
 # OpenSearch connection
 # ----------------------------
@@ -106,6 +326,7 @@ def connect_long() -> OpenSearch:
         timeout=60,
         max_retries=3,
         retry_on_timeout=True,
+        http_compress=True,  # gzip request bodies; bulk payloads are mostly text
     )
     return client
 
@@ -133,6 +354,7 @@ def ensure_index(
             "number_of_replicas": 0
         },
         "mappings": {
+            "_routing": {"required": False},
             "properties": {
                 "content": {"type": "text"},
                 "category": {"type": "keyword", "normalizer": "lowercase_normalizer"},
@@ -140,7 +362,8 @@ def ensure_index(
                 "explicit_terms": {"type": "keyword", "normalizer": "lowercase_normalizer"},
                 "explicit_terms_text": {"type": "text"},
                 "ingested_at_ms": {"type": "date", "format": "epoch_millis"},
-                "doc_version": {"type": "long"}
+                "doc_version": {"type": "long"},
+                "content_hash": {"type": "keyword"}
             }
         },
     }
@@ -148,63 +371,204 @@ def ensure_index(
         body["mappings"]["properties"].update(extra_properties)
     client.indices.create(index=index_name, body=body)
 
+def get_ingest_settings(client: OpenSearch, indices: List[str]) -> Dict[str, Dict[str, Optional[str]]]:
+    """Current values of the settings overridden during ingest (None = cluster default)."""
+    res = client.indices.get_settings(index=",".join(indices), flat_settings=True)
+    return {
+        name: {key: res.get(name, {}).get("settings", {}).get(key) for key in INGEST_SETTING_KEYS}
+        for name in indices
+    }
+
 # ----------------------------
 # Ingest
 # ----------------------------
-def ingest_bbc(client: OpenSearch, data_dir: str, index_name: str, chunk_index_name: str) -> None:
-    ensure_index(client, index_name)
-    ensure_index(
-        client,
-        chunk_index_name,
-        extra_properties={
-            "chunk_index": {"type": "integer"},
-            "chunk_count": {"type": "integer"},
-            "parent_filepath": {"type": "keyword"},
-        },
-    )
+def iter_files(data_dir: str) -> Iterator[str]:
+    """Lazily yield <data_dir>/<category>/*.txt paths, sorted within each category."""
+    if not os.path.isdir(data_dir):
+        return
+    categories = sorted((e for e in os.scandir(data_dir) if e.is_dir()), key=lambda e: e.name)
+    for category in categories:
+        names = sorted(
+            e.name for e in os.scandir(category.path)
+            if e.name.endswith(".txt") and e.is_file()
+        )
+        for name in names:
+            yield os.path.join(category.path, name)
+
+
+def read_file(fp: str) -> Tuple[Path, str]:
+    # Newlines are normalized once here so NER offsets, paragraph splitting and
+    # paragraph_offsets all see the same text.
+    p = Path(fp)
+    return p, normalize_newlines(p.read_text(encoding="utf-8", errors="ignore"))
+
+
+def terms_from_spans(text: str, paragraphs: List[str], spans: List[dict]) -> Tuple[List[str], List[List[str]]]:
+    """Document terms, plus per-chunk terms from the entities inside each paragraph."""
+    explicit_terms = _normalize_entities(s["text"] for s in spans)
+    chunk_terms_list = [
+        _normalize_entities(s["text"] for s in spans if s["start"] >= start and s["end"] <= end)
+        for start, end in paragraph_offsets(text, paragraphs)
+    ]
+    return explicit_terms, chunk_terms_list
+
+
+def analyze_file(item: Tuple[Path, str]) -> Tuple[Path, str, List[str], List[str], List[List[str]]]:
+    """Run NER over one article via the NER service (safe to call from worker threads)."""
+    p, text = item
+
+    # Paragraph-level chunking is the default granularity for the RAG agent.
+    paragraphs = split_into_paragraphs(text)
+
+    # One NER call over the full text; each chunk takes the entities whose
+    # character span falls inside its paragraph.
+    spans = post_ner_spans(text) if paragraphs else None
+    if spans is not None:
+        explicit_terms, chunk_terms_list = terms_from_spans(text, paragraphs, spans)
+    # Server without offsets: NER runs once per paragraph and the document
+    # terms are their union (first-seen order).
+    elif paragraphs:
+        chunk_terms_list = extract_normalized_entities_batch(paragraphs)
+        explicit_terms = list(dict.fromkeys(t for terms in chunk_terms_list for t in terms))
+    else:
+        chunk_terms_list = []
+        explicit_terms = extract_normalized_entities_from_text(text)
 
-    files = sorted(glob.glob(os.path.join(data_dir, "*", "*.txt")))
-    if not files:
-        print(f"[INFO] No files found under {data_dir}/*/*.txt"); return
+    return p, text, paragraphs, explicit_terms, chunk_terms_list
 
-    now_ms = int(time.time() * 1000)
 
-    for fp in files:
-        p = Path(fp)
-        category = p.parent.name
-        text = p.read_text(encoding="utf-8", errors="ignore")
+def analyze_files_local(items: Iterable[Tuple[Path, str]]) -> Iterator[tuple]:
+    """In-process counterpart of analyze_file: NER runs over NER_BATCH_SIZE articles at a time."""
+    it = iter(items)
+    while True:
+        batch = list(islice(it, NER_BATCH_SIZE))
+        if not batch:
+            return
+        for (p, text), spans in zip(batch, ner_batch([text for _, text in batch])):
+            paragraphs = split_into_paragraphs(text)
+            yield (p, text, paragraphs, *terms_from_spans(text, paragraphs, spans))
 
-        explicit_terms = extract_normalized_entities_from_text(text)
+
+def chunk_doc_id(doc_id: str, idx: int) -> str:
+    return f"{doc_id}::chunk-{idx:03d}"
+
+
+def skip_unchanged(
+    client: OpenSearch,
+    index_name: str,
+    chunk_index_name: Optional[str],
+    items: Iterable[Tuple[Path, str]],
+    stats: Dict[str, int],
+    previous_versions: Dict[str, int],
+    batch_size: int = 1000,
+) -> Iterator[Tuple[Path, str]]:
+    """
+    Drop articles whose indexed content_hash matches the file, checked via batched
+    mget. With chunking on, every expected chunk in chunk_index_name must carry the
+    same hash too, so articles indexed without (or with only some of) their chunks
+    are re-ingested. The stored doc_version of re-ingested articles is recorded
+    in previous_versions.
+    """
+    it = iter(items)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            return
+        hashes = {p.as_posix(): content_hash(text) for p, text in batch}
+        res = client.mget(
+            index=index_name,
+            body={"docs": [{"_id": i, "routing": i, "_source": ["content_hash", "doc_version"]} for i in hashes]},
+        )
+        indexed = {d["_id"]: d.get("_source", {}) for d in res.get("docs", []) if d.get("found")}
+        unchanged = {i for i, h in hashes.items() if indexed.get(i, {}).get("content_hash") == h}
+
+        if chunk_index_name and unchanged:
+            expected = {
+                p.as_posix(): [chunk_doc_id(p.as_posix(), n) for n in range(len(split_into_paragraphs(text)))]
+                for p, text in batch if p.as_posix() in unchanged
+            }
+            chunk_docs = [
+                {"_id": cid, "routing": i, "_source": ["content_hash"]}
+                for i, cids in expected.items() for cid in cids
+            ]
+            chunk_hashes: Dict[str, Optional[str]] = {}
+            if chunk_docs:
+                res = client.mget(index=chunk_index_name, body={"docs": chunk_docs})
+                chunk_hashes = {
+                    d["_id"]: d.get("_source", {}).get("content_hash")
+                    for d in res.get("docs", []) if d.get("found")
+                }
+            unchanged = {
+                i for i in unchanged
+                if all(chunk_hashes.get(cid) == hashes[i] for cid in expected[i])
+            }
+
+        for p, text in batch:
+            doc_id = p.as_posix()
+            if doc_id in unchanged:
+                stats["skipped"] += 1
+                continue
+            src = indexed.get(doc_id)
+            if src is not None and isinstance(src.get("doc_version"), int):
+                previous_versions[doc_id] = src["doc_version"]
+            yield p, text
+
+
+def bounded_map(pool: ThreadPoolExecutor, fn: Callable, items: Iterable, max_pending: int) -> Iterator:
+    """Like pool.map, but keeps at most max_pending calls in flight; yields results in order."""
+    pending: Deque[Future] = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def build_actions(
+    analyses: Iterable[tuple],
+    index_name: str,
+    chunk_index_name: Optional[str],
+    now_ms: int,
+    stats: Dict[str, int],
+    previous_versions: Dict[str, int],
+) -> Iterator[dict]:
+    """Yield bulk index actions for every parent doc and its paragraph chunks."""
+    # Shared by every doc in the run; a doc whose stored version is not older
+    # than now_ms gets stored version + 1 so re-ingests always bump doc_version.
+    common = {"ingested_at_ms": now_ms, "doc_version": now_ms}
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for p, text, paragraphs, explicit_terms, chunk_terms_list in analyses:
+        stats["docs"] += 1
+        if stats["docs"] % PROGRESS_EVERY == 0:
+            logger.info(f"[INGEST] {stats['docs']} docs processed")
+        category = p.parent.name
 
         # Stable document id based on relative filepath
         doc_id = p.as_posix()
+        text_hash = content_hash(text)
+        previous = previous_versions.pop(doc_id, None)
+        versioning = common if previous is None or previous < now_ms else {**common, "doc_version": previous + 1}
 
         doc = {
             "content": text,
             "category": category,
             "filepath": doc_id,
             "explicit_terms": explicit_terms,
-            "explicit_terms_text": " ".join(explicit_terms) if explicit_terms else "",
-            "ingested_at_ms": now_ms,
-            "doc_version": now_ms,  # simple monotonic version; update on re-ingest
+            "explicit_terms_text": " ".join(explicit_terms),
+            "content_hash": text_hash,
+            **versioning,
         }
 
-        print(f"[INGEST] {doc_id} ({len(text)} chars):\nexplicit terms: {explicit_terms}\n")
-        client.index(index=index_name, id=doc_id, body=doc, refresh=False)
+        if debug:
+            logger.debug(f"[INGEST] {doc_id} ({len(text)} chars):\nexplicit terms: {explicit_terms}\n")
+        yield {"_op_type": "index", "_index": index_name, "_id": doc_id, "_routing": doc_id, "_source": doc}
 
-        # Paragraph-level chunking is the default granularity for the RAG agent.
-        paragraphs = split_into_paragraphs(text)
-        if not paragraphs:
+        if not chunk_index_name or not paragraphs:
             continue
 
         chunk_count = len(paragraphs)
-        for idx, paragraph in enumerate(paragraphs):
-            # trim paragraph and skip empty ones
-            paragraph = paragraph.strip()
-            if not paragraph:
-                continue
-
-            chunk_terms = extract_normalized_entities_from_text(paragraph) if paragraph else []
+        for idx, (paragraph, chunk_terms) in enumerate(zip(paragraphs, chunk_terms_list)):
             chunk_doc = {
                 "content": paragraph,
                 "category": category,
@@ -213,27 +577,154 @@ def ingest_bbc(client: OpenSearch, data_dir: str, index_name: str, chunk_index_n
                 "chunk_index": idx,
                 "chunk_count": chunk_count,
                 "explicit_terms": chunk_terms,
-                "explicit_terms_text": " ".join(chunk_terms) if chunk_terms else "",
-                "ingested_at_ms": now_ms,
-                "doc_version": now_ms,
+                "explicit_terms_text": " ".join(chunk_terms),
+                # Parent's hash: lets skip_unchanged confirm the chunks are current
+                "content_hash": text_hash,
+                **versioning,
+            }
+            chunk_id = chunk_doc_id(doc_id, idx)
+            if debug:
+                logger.debug(
+                    f"[INGEST][CHUNK] {chunk_id} ({len(paragraph)} chars):\n"
+                    f"explicit terms: {chunk_terms}\n"
+                )
+            # Route chunks by parent id so an article's chunks share one shard.
+            yield {
+                "_op_type": "index",
+                "_index": chunk_index_name,
+                "_id": chunk_id,
+                "_routing": doc_id,
+                "_source": chunk_doc,
             }
-            chunk_doc_id = f"{doc_id}::chunk-{idx:03d}"
-            print(
-                f"[INGEST][CHUNK] {chunk_doc_id} ({len(paragraph)} chars):\n"
-                f"explicit terms: {chunk_terms}\n"
-            )
-            client.index(index=chunk_index_name, id=chunk_doc_id, body=chunk_doc, refresh=False)
 
-    client.indices.refresh(index=index_name)
-    client.indices.refresh(index=chunk_index_name)
-    print(
-        f"[OK] Ingest complete. Indexed {len(files)} docs into '{index_name}' and "
-        f"{chunk_index_name}"
+
+def chunked_actions(
+    actions: Iterable[dict],
+    max_docs: int = BULK_CHUNK_SIZE,
+    max_bytes: int = BULK_MAX_BYTES,
+) -> Iterator[List[dict]]:
+    """Group bulk actions into batches that stay under both the doc-count and byte caps."""
+    batch: List[dict] = []
+    batch_bytes = 0
+    for action in actions:
+        # Approximate NDJSON size: metadata line + source line + two newlines
+        meta = {k: v for k, v in action.items() if k != "_source"}
+        action_bytes = len(orjson.dumps(meta)) + len(orjson.dumps(action["_source"])) + 2
+        if batch and (len(batch) >= max_docs or batch_bytes + action_bytes > max_bytes):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(action)
+        batch_bytes += action_bytes
+    if batch:
+        yield batch
+
+
+def ingest_bbc(
+    client: OpenSearch,
+    data_dir: str,
+    index_name: str,
+    chunk_index_name: Optional[str],
+    force: bool = False,
+) -> None:
+    """
+    Index every article under data_dir, plus paragraph chunks into chunk_index_name
+    (None disables chunking). Unchanged articles are skipped unless force is set.
+    """
+    ensure_index(client, index_name)
+    if chunk_index_name:
+        ensure_index(
+            client,
+            chunk_index_name,
+            extra_properties={
+                "chunk_index": {"type": "integer"},
+                "chunk_count": {"type": "integer"},
+                "parent_filepath": {"type": "keyword"},
+            },
+        )
+
+    files = iter_files(data_dir)
+    first = next(files, None)
+    if first is None:
+        logger.info(f"[INFO] No files found under {data_dir}/*/*.txt"); return
+    files = chain([first], files)
+
+    now_ms = int(time.time() * 1000)
+    stats = {"docs": 0, "skipped": 0}
+    previous_versions: Dict[str, int] = {}
+
+    # No periodic refreshes or replica writes while bulk loading; the previous
+    # settings are put back even if ingest fails.
+    indices = [index_name, chunk_index_name] if chunk_index_name else [index_name]
+    previous_settings = get_ingest_settings(client, indices)
+    client.indices.put_settings(index=",".join(indices), body={"index": INGEST_SETTINGS})
+    try:
+        # Keep several files' NER requests in flight while finished ones stream
+        # through _bulk instead of one HTTP round-trip per document.
+        # File reads are prefetched on their own pool so article text is already in
+        # memory by the time a NER worker frees up.
+        with ThreadPoolExecutor(max_workers=READ_WORKERS) as read_pool, \
+                ThreadPoolExecutor(max_workers=NER_WORKERS) as pool:
+            texts = bounded_map(read_pool, read_file, files, max_pending=READ_PREFETCH)
+            if not force:
+                texts = skip_unchanged(client, index_name, chunk_index_name, texts, stats, previous_versions)
+            if NER_MODE == "http":
+                analyses = bounded_map(pool, analyze_file, texts, max_pending=2 * NER_WORKERS)
+            else:
+                analyses = analyze_files_local(texts)
+            actions = build_actions(analyses, index_name, chunk_index_name, now_ms, stats, previous_versions)
+            indexed, errors = 0, []
+            for batch in chunked_actions(actions):
+                ok, failed = helpers.bulk(
+                    client,
+                    batch,
+                    chunk_size=len(batch),
+                    max_chunk_bytes=BULK_MAX_BYTES,
+                    raise_on_error=False,
+                    request_timeout=120,
+                )
+                indexed += ok
+                errors.extend(failed)
+    finally:
+        for name, settings in previous_settings.items():
+            client.indices.put_settings(index=name, body=settings)
+    for err in errors:
+        logger.warning(f"[WARN] Bulk item failed: {err}")
+
+    # Nothing written (e.g. every article unchanged): no refresh or merge needed
+    if indexed > 0:
+        for name in indices:
+            client.indices.refresh(index=name)
+        if FORCE_MERGE_SEGMENTS > 0:
+            client.indices.forcemerge(
+                index=",".join(indices),
+                max_num_segments=FORCE_MERGE_SEGMENTS,
+                request_timeout=600,
+            )
+    logger.info(
+        f"[OK] Ingest complete. Indexed {stats['docs']} docs into "
+        f"{' and '.join(repr(name) for name in indices)} ({indexed} bulk actions, {len(errors)} failed, "
+        f"{stats['skipped']} unchanged skipped)"
     )
 
 def main():
+    parser = argparse.ArgumentParser(description="Ingest BBC articles (and paragraph chunks) into OpenSearch.")
+    parser.add_argument("--data-dir", default=DATA_DIR,
+                        help="Root folder laid out as <category>/*.txt (default: $DATA_DIR or 'bbc').")
+    parser.add_argument("--index-name", default=INDEX_NAME,
+                        help="Index for whole articles (default: $INDEX_NAME or 'bbc').")
+    parser.add_argument("--chunks", action=argparse.BooleanOptionalAction, default=True,
+                        help="Also index paragraph-level chunks (default ON; --no-chunks for articles only).")
+    parser.add_argument("--chunk-index-name", default=CHUNK_INDEX_NAME,
+                        help="Index for paragraph chunks (default: $CHUNK_INDEX_NAME or 'bbc-chunks').")
+    parser.add_argument("--force", action="store_true",
+                        default=os.getenv("FORCE_REINDEX", "false").lower() == "true",
+                        help="Re-index articles even when their content is unchanged.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s")
     client = connect_long()
-    ingest_bbc(client, DATA_DIR, INDEX_NAME, CHUNK_INDEX_NAME)
+    chunk_index_name = args.chunk_index_name if args.chunks else None
+    ingest_bbc(client, args.data_dir, args.index_name, chunk_index_name, force=args.force)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+spaCy model and entity filter shared by the NER service and in-process ingest.
+
+spaCy itself is imported on first load_spacy() call, so importing this module
+for its configuration (model name, labels) stays cheap.
+"""
+
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    import spacy
+    from spacy.tokens import Doc
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+# Default set of "interesting" entity types.
+DEFAULT_INTERESTING_ENTITY_TYPES = {
+    "PERSON",
+    "ORG",
+    "PRODUCT",
+    "GPE",
+    "EVENT",
+    "WORK_OF_ART",
+    "NORP",
+    "LOC",
+    "FAC",
+}
+
+
+@lru_cache(maxsize=1)
+def load_spacy() -> "spacy.Language":
+    import spacy
+    return spacy.load(SPACY_MODEL)
+
+
+def entities_from_doc(doc: Doc, allowed_labels: set[str]) -> List[Tuple[str, str]]:
+    return [
+        (ent.text.strip().lower(), ent.label_)
+        for ent in doc.ents
+        if ent.label_ in allowed_labels and len(ent.text.strip()) >= 3
+    ]
+
+
+def entity_spans_from_doc(doc: Doc, allowed_labels: set[str]) -> List[Dict[str, Any]]:
+    # Same filter as entities_from_doc, keeping character offsets into the text
+    return [
+        {"text": ent.text.strip().lower(), "label": ent.label_, "start": ent.start_char, "end": ent.end_char}
+        for ent in doc.ents
+        if ent.label_ in allowed_labels and len(ent.text.strip()) >= 3
+    ]
@@ -11,13 +11,27 @@ POST /ner
     Request (JSON):
         {
           "text": "Your input text...",
-          "labels": ["PERSON","ORG","GPE"]   # optional override of allowed labels
+          "labels": ["PERSON","ORG","GPE"],  # optional override of allowed labels
+          "spans": true                      # optional: also return character offsets
         }
     Response (JSON):
         {
           "text": "...",
           "model": "en_core_web_sm",
           "entities": ["openai", "san francisco"],
+          "spans": [{"text": "openai", "label": "ORG", "start": 0, "end": 6}, ...],  # only if requested
+          "request_id": "..."
+        }
+
+    Batch request (JSON):
+        {
+          "texts": ["First text...", "Second text..."],
+          "labels": ["PERSON","ORG","GPE"]   # optional
+        }
+    Batch response (JSON):
+        {
+          "model": "en_core_web_sm",
+          "entities": [["openai"], ["san francisco"]],
           "request_id": "..."
         }
 
@@ -38,7 +52,15 @@ from typing import List, Tuple, Dict, Any
 import requests
 from flask import Flask, jsonify, request
 import spacy
-from functools import lru_cache
+
+# Model name, label filter and span helpers are shared with in-process ingest
+from ner_model import (
+    DEFAULT_INTERESTING_ENTITY_TYPES,
+    SPACY_MODEL,
+    entities_from_doc,
+    entity_spans_from_doc,
+    load_spacy,
+)
 
 # ---------------------------
 # Configuration helpers
@@ -62,8 +84,6 @@ def _basic_auth(user: str, pwd: str):
 # Environment
 # ---------------------------
 
-SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
-
 # HOT (dest) - how THIS service reaches it
 OPENSEARCH_HOST = os.getenv("OPENSEARCH_HOST", "127.0.0.1")
 OPENSEARCH_PORT = int(os.getenv("OPENSEARCH_PORT", "9201"))
@@ -72,44 +92,17 @@ OPENSEARCH_PASS = os.getenv("OPENSEARCH_PASS", "")
 OPENSEARCH_SSL = _as_bool(os.getenv("OPENSEARCH_SSL"), False)
 OPENSEARCH_VERIFY_SSL = _as_bool(os.getenv("OPENSEARCH_VERIFY_SSL"), True)
 
-# Default set of "interesting" entity types.
-DEFAULT_INTERESTING_ENTITY_TYPES = {
-    "PERSON",
-    "ORG",
-    "PRODUCT",
-    "GPE",
-    "EVENT",
-    "WORK_OF_ART",
-    "NORP",
-    "LOC",
-    "FAC",
-}
-
 # ---------------------------
 # spaCy load
 # ---------------------------
 
-@lru_cache(maxsize=1)
-def load_spacy():
-    return spacy.load(SPACY_MODEL)
-
 nlp = load_spacy()
 
 # ---------------------------
 # Entity Extraction
 # ---------------------------
 
-def _extract_entities(nlp_obj: spacy.Language, text: str, allowed_labels: set[str]) -> List[Tuple[str, str]]:
-    doc = nlp_obj(text)
-    return [
-        (ent.text.strip().lower(), ent.label_)
-        for ent in doc.ents
-        if ent.label_ in allowed_labels and len(ent.text.strip()) >= 3
-    ]
-
-def _extract_normalized_entities(nlp_obj: spacy.Language, text: str, allowed_labels: set[str]) -> List[str]:
-    ent_pairs = _extract_entities(nlp_obj, text, allowed_labels)
-
+def _normalize_entity_pairs(ent_pairs: List[Tuple[str, str]]) -> List[str]:
     # Normalize: lowercase, dedupe while preserving order
     seen = set()
     normalized: List[str] = []
@@ -120,6 +113,13 @@ def _extract_normalized_entities(nlp_obj: spacy.Language, text: str, allowed_lab
 
     return normalized
 
+def _extract_normalized_entities_batch(nlp_obj: spacy.Language, texts: List[str], allowed_labels: set[str]) -> List[List[str]]:
+    # nlp.pipe batches the texts through the model instead of one call per text
+    return [
+        _normalize_entity_pairs(entities_from_doc(doc, allowed_labels))
+        for doc in nlp_obj.pipe(texts)
+    ]
+
 # ---------------------------
 # Flask App (synchronous path)
 # ---------------------------
@@ -142,21 +142,43 @@ def health():
         },
     }), 200
 
+def _allowed_labels(data: Dict[str, Any]) -> set[str]:
+    # Optional override of allowed labels
+    labels_field = data.get("labels")
+    if isinstance(labels_field, list) and labels_field:
+        return set(labels_field)
+    return DEFAULT_INTERESTING_ENTITY_TYPES
+
+def _ner_batch(data: Dict[str, Any]):
+    texts = data["texts"]
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        return jsonify({"error": "Invalid request", "detail": "Expected 'texts' to be a list of strings."}), 400
+
+    entities = _extract_normalized_entities_batch(nlp, texts, _allowed_labels(data))
+
+    print(f"[{datetime.now(timezone.utc).isoformat()}] /ner batch called, {len(texts)} texts, "
+          f"{sum(len(e) for e in entities)} entities")
+
+    return jsonify({
+        "model": SPACY_MODEL,
+        "entities": entities,
+        "request_id": str(uuid.uuid4()),
+    }), 200
+
 @app.route("/ner", methods=["POST"])
 def ner():
     data = request.get_json(silent=True)
+    if data and "texts" in data:
+        return _ner_batch(data)
     if not data or "text" not in data or not isinstance(data["text"], str):
-        return jsonify({"error": "Invalid request", "detail": "Expected JSON with a 'text' string field."}), 400
+        return jsonify({"error": "Invalid request", "detail": "Expected JSON with a 'text' string field or a 'texts' list."}), 400
 
     text: str = data["text"]
-    # Optional override of allowed labels
-    labels_field = data.get("labels")
-    if isinstance(labels_field, list) and labels_field:
-        allowed = set(labels_field)
-    else:
-        allowed = DEFAULT_INTERESTING_ENTITY_TYPES
+    allowed = _allowed_labels(data)
 
-    entities = _extract_normalized_entities(nlp, text, allowed)
+    doc = nlp(text)
+    entities = _normalize_entity_pairs(entities_from_doc(doc, allowed))
+    spans = entity_spans_from_doc(doc, allowed) if data.get("spans") else None
 
     # print with entities
     print(f"[{datetime.now(timezone.utc).isoformat()}] /ner called, {len(text)} chars, {len(entities)} entities")
@@ -172,6 +194,8 @@ def ner():
             "entities": entities,
             "request_id": request_id,
         }
+        if spans is not None:
+            payload["spans"] = spans
     except requests.HTTPError as e:
         status_code = getattr(e.response, "status_code", 500) or 500
         payload = {
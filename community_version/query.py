@@ -7,6 +7,7 @@ parallel queries, deterministic ranking, and explainable matches.
 Observability controls (default OFF):
   --observability           Print query JSON and match summaries (no disk writes)
   --save-results PATH       Append compact JSONL per query (safe-by-default off)
+  --no-ner-cache            Re-run NER for every question (default: memoized per question)
 
 Environment (override as needed)
 --------------------------------
@@ -56,7 +57,9 @@ from datetime import datetime
 # ---------------------------------------------------------------------------
 try:
     from common import (
-        ask,                    # orchestrator: NER -> dual search (LONG/HOT) -> context -> LLM answer
+        retrieve,               # batch NER -> dual _msearch (LONG/HOT) -> ranked hits per question
+        build_context,          # hits -> LLM context block
+        generate_answer,        # context -> LLM answer
         load_llm,               # cached Llama loader (llama.cpp)
     )
 except Exception as e:
@@ -69,7 +72,6 @@ except Exception as e:
 import requests
 from opensearchpy import OpenSearch
 from opensearchpy.exceptions import TransportError
-from llama_cpp import Llama
 
 
 ##############################################################################
@@ -85,6 +87,8 @@ def main():
                         help="Append compact JSONL result records to this path (default OFF).")
     parser.add_argument("--top-k", type=int, default=10,
                         help="Number of top documents to retrieve and provide to the LLM (default 10).")
+    parser.add_argument("--no-ner-cache", action="store_true", default=False,
+                        help="Call the NER service for every question instead of reusing memoized entities.")
     args = parser.parse_args()
 
     llm = load_llm()
@@ -99,18 +103,26 @@ def main():
             "How much did OpenAI purchase Windsurf for?"
         ]
 
-    for q in questions:
+    # All questions are retrieved up front: one _msearch per store for the batch
+    t0 = time.time()
+    results = retrieve(questions, observability=args.observability, save_path=args.save_results, top_k=args.top_k,
+                       ner_cache=not args.no_ner_cache)
+    search_dt = time.time() - t0
+    print(f"\nRetrieval time: {search_dt:.2f}s for {len(questions)} question(s)   (one _msearch per store, stores in parallel)")
+
+    for n, (q, hits) in enumerate(zip(questions, results), 1):
         print("\n" + "=" * 88)
-        print(f"QUESTION: {q}")
+        # Same [Qn/N] tag as the observability blocks printed during retrieval
+        print(f"[Q{n}/{len(questions)}] QUESTION: {q}")
         print("=" * 88)
+        # Tokens stream under the header as they are generated; the header is
+        # printed by generate_answer so it follows any --observability prompt dump
         t0 = time.time()
-        answer, hits = ask(llm, q, observability=args.observability, save_path=args.save_results, top_k=args.top_k)
+        generate_answer(llm, q, build_context(hits), args.observability, stream=True,
+                        stream_header="\n" + "=" * 88 + "\nANSWER: ")
         dt = time.time() - t0
-
-        print("\n" + "=" * 88)
-        print(f"ANSWER: {answer}")
         print("\n" + "=" * 88)
-        print(f"\nQuery time: {dt:.2f}s   (stores queried in parallel)")
+        print(f"\nAnswer time: {dt:.2f}s")
         print(f"Docs provided to LLM: {len(hits)}\n")
 
 